@@ -160,6 +160,16 @@ class CircuitBreaker:
             health.last_success = time.time()
             log.info("CB  %s: OPEN -> HALF_OPEN (reconnected)", adapter_name)
 
+    def force_open(self, adapter_name: str) -> None:
+        """Trip an adapter straight to OPEN without counting failures."""
+        health = self._adapters.get(adapter_name)
+        if not health or health.state == AdapterState.OPEN:
+            return
+
+        log.warning("CB  %s: %s -> OPEN (forced)", adapter_name, health.state.value)
+        health.state = AdapterState.OPEN
+        self._evaluate_global_state()
+
     def check_stale(self) -> list[str]:
         """Check for adapters that haven't sent data recently."""
         now = time.time()
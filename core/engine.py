@@ -17,6 +17,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Callable
 
 from core.circuit_breaker import CircuitBreaker
@@ -37,6 +38,19 @@ POSITION_MONITOR_INTERVAL: float = 10.0
 RESOLUTION_WIN_THRESHOLD: float = 1.0
 RESOLUTION_LOSS_THRESHOLD: float = 0.01
 STALE_CYCLES_THRESHOLD: int = 60
+# Every monitor read takes an API RateLimiter token. Keep few in flight so a
+# trade's market_buy/get_balance_usdc never queues behind a whole book's reads.
+POSITION_CHECK_CONCURRENCY: int = 4
+
+
+@dataclass(slots=True)
+class _PositionReads:
+    """CLOB data fetched for one position in a monitor pass."""
+
+    outcome: str | None = None
+    shares: float | None = None
+    bid: float | None = None
+    bid_error: Exception | None = None
 
 
 class SniperEngine:
@@ -101,9 +115,10 @@ class SniperEngine:
             self._reject(opp.token_id)
             return
 
+        trading = settings.trading
         try:
             ask, available_shares = await polymarket.available_liquidity(
-                opp.token_id, settings.trading.max_buy_price
+                opp.token_id, trading.max_buy_price
             )
         except Exception as exc:
             log.warning("CLOB error for token %s: %s", opp.token_id[:12], exc)
@@ -115,18 +130,18 @@ class SniperEngine:
             self._reject(opp.token_id)
             return
 
-        if ask < settings.trading.min_buy_price:
+        if ask < trading.min_buy_price:
             log.info(
                 "SKIP  CLOB ask=$%.4f < min=$%.2f for '%s'",
-                ask, settings.trading.min_buy_price, opp.question[:60],
+                ask, trading.min_buy_price, opp.question[:60],
             )
             self._reject(opp.token_id)
             return
 
-        if ask > settings.trading.max_buy_price:
+        if ask > trading.max_buy_price:
             log.info(
                 "SKIP  CLOB ask=$%.4f > max=$%.2f for '%s'",
-                ask, settings.trading.max_buy_price, opp.question[:60],
+                ask, trading.max_buy_price, opp.question[:60],
             )
             self._reject(opp.token_id)
             return
@@ -215,14 +230,14 @@ class SniperEngine:
             "ask_price": ask,
             "amount": amount,
             "latency_ms": round(latency_ms, 1),
-            "dry_run": settings.trading.dry_run,
+            "dry_run": trading.dry_run,
             "result": result,
             "open_positions": self._risk.open_positions,
             "total_exposure": self._risk.total_exposure,
         }
         self._trades.append(trade_info)
 
-        mode = "DRY RUN" if settings.trading.dry_run else "LIVE"
+        mode = "DRY RUN" if trading.dry_run else "LIVE"
         msg = (
             f"[{mode}] Trade executed\n"
             f"Market: {opp.question}\n"
@@ -250,113 +265,153 @@ class SniperEngine:
         if not positions:
             return
 
+        # Only the CLOB reads overlap, POSITION_CHECK_CONCURRENCY at a time.
+        sem = asyncio.Semaphore(POSITION_CHECK_CONCURRENCY)
+
+        async def _bounded(pos: PositionRecord) -> _PositionReads:
+            async with sem:
+                return await self._read_position(pos)
+
+        results = await asyncio.gather(
+            *(_bounded(pos) for pos in positions),
+            return_exceptions=True,
+        )
+
+        # Sells, redeems and alerts stay strictly sequential: redeems build
+        # Safe/EOA transactions from the current nonce, and each sell cancels
+        # the account's open orders first.
         changed = False
+        for pos, reads in zip(positions, results):
+            if isinstance(reads, BaseException):
+                log.debug("Position monitor error for %s: %s", pos.token_id[:12], reads)
+                continue
+            if await self._apply_position_reads(pos, reads):
+                changed = True
+        if changed:
+            self._save_state()
 
-        for pos in positions:
-            try:
-                pnl: float | None = None
-                source = ""
-
-                if pos.condition_id:
-                    outcome = await polymarket.get_market_resolution(pos.condition_id)
-                    if outcome is not None:
-                        won = outcome.lower() == pos.team.lower()
-                        resolution_price = 1.0 if won else 0.0
-                        pnl = self._risk.close_position_with_pnl(
-                            pos.token_id, resolution_price, source="resolution",
-                        )
-                        source = "API"
-
-                if pnl is None:
-                    # --- Manual-sell detection ---
-                    # Every 60s, check the real CLOB token balance.
-                    # Requires 2 consecutive zero-balance confirmations to avoid
-                    # false positives from transient API errors or network glitches.
-                    now_ts = time.time()
-                    last_check = self._last_balance_check.get(pos.token_id, 0.0)
-                    if now_ts - last_check >= 60.0:
-                        self._last_balance_check[pos.token_id] = now_ts
-                        true_shares = await polymarket.get_token_balance(pos.token_id)
-
-                        if true_shares > 0.0:
-                            # Shares confirmed — reset any pending confirmation counter
-                            self._zero_balance_confirmations.pop(pos.token_id, None)
-                        elif true_shares == 0.0:
-                            # First zero reading: increment confirmation counter
-                            confirmations = self._zero_balance_confirmations.get(pos.token_id, 0) + 1
-                            self._zero_balance_confirmations[pos.token_id] = confirmations
-                            log.debug(
-                                "AUTO-CLEAN  %s: zero balance confirmation %d/2",
-                                pos.team, confirmations,
-                            )
-                            if confirmations >= 2:
-                                # Two consecutive zeros — safe to clean
-                                label = pos.question[:60] if pos.question else pos.team
-                                log.info(
-                                    "AUTO-CLEAN  Position '%s' confirmed 0 shares "
-                                    "— removed from state (manual sell detected)",
-                                    label,
-                                )
-                                self._risk.close_position(pos.token_id)
-                                self._last_balance_check.pop(pos.token_id, None)
-                                self._zero_balance_confirmations.pop(pos.token_id, None)
-                                changed = True
-                                await send_alert(
-                                    f"Position Closed Externally\n"
-                                    f"Market: {pos.team}\n"
-                                    f"Bought@${pos.buy_price:.4f}\n"
-                                    f"Source: manual-sell"
-                                )
-                                continue
-                        # true_shares == -1.0 → fetch failed, do nothing
-
-                    try:
-                        bid = await polymarket.best_bid(pos.token_id)
-                    except Exception as exc:
-                        self._stale_counts[pos.token_id] = self._stale_counts.get(pos.token_id, 0) + 1
-                        count = self._stale_counts[pos.token_id]
+    async def _read_position(self, pos: PositionRecord) -> _PositionReads:
+        """Fetch the CLOB reads one monitor pass needs for ``pos``; places no orders."""
+        reads = _PositionReads()
+        if pos.condition_id:
+            reads.outcome = await polymarket.get_market_resolution(pos.condition_id)
+            if reads.outcome is not None:
+                return reads
+
+        # Every 60s, check the real CLOB token balance (manual-sell detection).
+        now_ts = time.time()
+        last_check = self._last_balance_check.get(pos.token_id, 0.0)
+        if now_ts - last_check >= 60.0:
+            self._last_balance_check[pos.token_id] = now_ts
+            reads.shares = await polymarket.get_token_balance(pos.token_id)
+            if reads.shares == 0.0 and self._zero_balance_confirmations.get(pos.token_id, 0) >= 1:
+                # Second consecutive zero: the position gets cleaned, no quote needed
+                return reads
+
+        try:
+            reads.bid = await polymarket.best_bid(pos.token_id)
+        except Exception as exc:
+            reads.bid_error = exc
+        return reads
+
+    async def _apply_position_reads(self, pos: PositionRecord, reads: _PositionReads) -> bool:
+        """Act on one position's monitor reads; return True if it was closed."""
+        changed = False
+        try:
+            pnl: float | None = None
+            source = ""
+
+            if reads.outcome is not None:
+                won = reads.outcome.lower() == pos.team.lower()
+                resolution_price = 1.0 if won else 0.0
+                pnl = self._risk.close_position_with_pnl(
+                    pos.token_id, resolution_price, source="resolution",
+                )
+                source = "API"
+
+            if pnl is None:
+                # --- Manual-sell detection ---
+                # Requires 2 consecutive zero-balance confirmations to avoid
+                # false positives from transient API errors or network glitches.
+                true_shares = reads.shares
+                if true_shares is not None:
+                    if true_shares > 0.0:
+                        # Shares confirmed — reset any pending confirmation counter
+                        self._zero_balance_confirmations.pop(pos.token_id, None)
+                    elif true_shares == 0.0:
+                        # First zero reading: increment confirmation counter
+                        confirmations = self._zero_balance_confirmations.get(pos.token_id, 0) + 1
+                        self._zero_balance_confirmations[pos.token_id] = confirmations
                         log.debug(
-                            "Position %s: order book error (%d/%d): %s",
-                            pos.team, count, STALE_CYCLES_THRESHOLD, exc,
+                            "AUTO-CLEAN  %s: zero balance confirmation %d/2",
+                            pos.team, confirmations,
                         )
-                        if count >= STALE_CYCLES_THRESHOLD:
-                            log.warning(
-                                "STALE  Removing ghost position %s (%s) after %d consecutive errors",
-                                pos.team, pos.token_id[:16], count,
+                        if confirmations >= 2:
+                            # Two consecutive zeros — safe to clean
+                            label = pos.question[:60] if pos.question else pos.team
+                            log.info(
+                                "AUTO-CLEAN  Position '%s' confirmed 0 shares "
+                                "— removed from state (manual sell detected)",
+                                label,
                             )
-                            pnl = self._risk.close_position_with_pnl(
-                                pos.token_id, pos.buy_price, source="stale-removed",
+                            self._risk.close_position(pos.token_id)
+                            self._last_balance_check.pop(pos.token_id, None)
+                            self._zero_balance_confirmations.pop(pos.token_id, None)
+                            changed = True
+                            await send_alert(
+                                f"Position Closed Externally\n"
+                                f"Market: {pos.team}\n"
+                                f"Bought@${pos.buy_price:.4f}\n"
+                                f"Source: manual-sell"
                             )
-                            source = "stale"
-                            self._stale_counts.pop(pos.token_id, None)
-                        else:
-                            continue
-                        bid = None
-
-                    if bid is not None:
+                            return changed
+                    # true_shares == -1.0 → fetch failed, do nothing
+
+                bid = reads.bid
+                if reads.bid_error is not None:
+                    exc = reads.bid_error
+                    self._stale_counts[pos.token_id] = self._stale_counts.get(pos.token_id, 0) + 1
+                    count = self._stale_counts[pos.token_id]
+                    log.debug(
+                        "Position %s: order book error (%d/%d): %s",
+                        pos.team, count, STALE_CYCLES_THRESHOLD, exc,
+                    )
+                    if count >= STALE_CYCLES_THRESHOLD:
+                        log.warning(
+                            "STALE  Removing ghost position %s (%s) after %d consecutive errors",
+                            pos.team, pos.token_id[:16], count,
+                        )
+                        pnl = self._risk.close_position_with_pnl(
+                            pos.token_id, pos.buy_price, source="stale-removed",
+                        )
+                        source = "stale"
                         self._stale_counts.pop(pos.token_id, None)
+                    else:
+                        return changed
+                    bid = None
+
+                if bid is not None:
+                    self._stale_counts.pop(pos.token_id, None)
+
+                exit_threshold = settings.trading.exit_sell_threshold
+                if bid is not None and bid >= exit_threshold:
+                    pnl = await self._execute_quick_exit(pos, bid)
+                    if pnl is not None:
+                        source = "quick-exit"
+
+                elif bid is not None and self._should_stop_loss(pos, bid):
+                    pnl = await self._execute_stop_loss(pos, bid)
+                    source = "stop-loss"
+
+            if pnl is not None:
+                changed = True
+                if source == "API" and pnl > 0 and pos.condition_id and self._claimer:
+                    await self._auto_redeem(pos)
+                await self._alert_position_closed(pos, pnl, source)
 
-                    exit_threshold = settings.trading.exit_sell_threshold
-                    if bid is not None and bid >= exit_threshold:
-                        pnl = await self._execute_quick_exit(pos, bid)
-                        if pnl is not None:
-                            source = "quick-exit"
-
-                    elif bid is not None and self._should_stop_loss(pos, bid):
-                        pnl = await self._execute_stop_loss(pos, bid)
-                        source = "stop-loss"
-
-                if pnl is not None:
-                    changed = True
-                    if source == "API" and pnl > 0 and pos.condition_id and self._claimer:
-                        await self._auto_redeem(pos)
-                    await self._alert_position_closed(pos, pnl, source)
-
-            except Exception as exc:
-                log.debug("Position monitor error for %s: %s", pos.token_id[:12], exc)
-
-        if changed:
-            self._save_state()
+        except Exception as exc:
+            log.debug("Position monitor error for %s: %s", pos.token_id[:12], exc)
+        return changed
 
     def _should_stop_loss(self, pos: PositionRecord, current_price: float) -> bool:
         sl = self._risk._cfg.stop_loss_pct
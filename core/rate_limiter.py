@@ -55,25 +55,21 @@ class RateLimiter:
         """Wait until a token is available, then consume it."""
         async with self._lock:
             self._refill()
-
-            if self._tokens >= 1.0:
-                self._tokens -= 1.0
-                self._total_calls += 1
+            # Reserve the token before sleeping (the bucket may go negative),
+            # so concurrent waiters queue up behind each other instead of all
+            # computing the same deficit and waking together.
+            self._tokens -= 1.0
+            self._total_calls += 1
+            if self._tokens >= 0.0:
                 return
 
-            deficit = 1.0 - self._tokens
-            wait_time = deficit / self._rate
+            wait_time = -self._tokens / self._rate
+            self._total_waits += 1
+            self._total_wait_time += wait_time
 
         log.debug("RATE LIMIT  waiting %.3fs for token", wait_time)
-        self._total_waits += 1
-        self._total_wait_time += wait_time
         await asyncio.sleep(wait_time)
 
-        async with self._lock:
-            self._refill()
-            self._tokens = max(0.0, self._tokens - 1.0)
-            self._total_calls += 1
-
     def _refill(self) -> None:
         now = time.monotonic()
         elapsed = now - self._last_refill
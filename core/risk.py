@@ -172,6 +172,7 @@ class RiskManager:
     ) -> None:
         """Record a successfully executed trade."""
         now = time.time()
+        self._prune_expired(now)
         self._positions.append(PositionRecord(
             token_id=token_id,
             game=game,
@@ -196,6 +197,15 @@ class RiskManager:
             self.open_positions, self.total_exposure,
         )
 
+    def _prune_expired(self, now: float) -> None:
+        """Forget dedup/cooldown stamps whose window has lapsed (they can never block)."""
+        dedup_cutoff = now - self._cfg.dedup_window_seconds
+        cooldown_cutoff = now - self._cfg.match_cooldown_seconds
+        self._trade_keys = {k: t for k, t in self._trade_keys.items() if t > dedup_cutoff}
+        self._match_cooldowns = {
+            m: t for m, t in self._match_cooldowns.items() if t > cooldown_cutoff
+        }
+
     def record_pnl(self, realized_pnl: float) -> None:
         """Update session PnL (negative = loss). May trigger halt."""
         self._session_pnl += realized_pnl
@@ -19,6 +19,106 @@ os.environ.setdefault("TELEGRAM_BOT_TOKEN", "")
 os.environ.setdefault("TELEGRAM_CHAT_ID", "")
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def event_queue():
+    # Engine tests drive _handle_opportunity directly and never touch the
+    # queue, so one empty queue per module is enough.
     return asyncio.Queue()
+
+
+class _FakeResp:
+    """Minimal stand-in for an aiohttp response context manager."""
+
+    def __init__(self, status: int = 200, body: str = "") -> None:
+        self.status = status
+        self._body = body
+
+    async def __aenter__(self) -> _FakeResp:
+        return self
+
+    async def __aexit__(self, *exc) -> bool:
+        return False
+
+    async def text(self) -> str:
+        return self._body
+
+
+class _FakeSession:
+    """Minimal stand-in for aiohttp.ClientSession that records POSTs."""
+
+    def __init__(self, resp: _FakeResp) -> None:
+        self._resp = resp
+        self.posts: list[tuple[str, dict]] = []
+
+    async def __aenter__(self) -> _FakeSession:
+        return self
+
+    async def __aexit__(self, *exc) -> bool:
+        return False
+
+    def post(self, url: str, **kwargs) -> _FakeResp:
+        self.posts.append((url, kwargs))
+        return self._resp
+
+
+@pytest.fixture
+def fake_http():
+    """Factory for a fake aiohttp session whose POSTs return one canned response."""
+    def _make(status: int = 200, body: str = "") -> _FakeSession:
+        return _FakeSession(_FakeResp(status, body))
+    return _make
+
+
+# ------------------------------------------------------------------
+# Shared risk/cb/engine stack for the dashboard tests
+# ------------------------------------------------------------------
+# The dashboard app binds these objects once per module. Modules that use
+# them opt in with ``pytestmark = pytest.mark.usefixtures("reset_shared_state")``
+# so each test starts from a fresh instance's state. Imports stay inside the
+# factories so modules that never ask for them don't load the trading SDK.
+def _new_risk():
+    from core.risk import RiskConfig, RiskManager
+
+    return RiskManager(RiskConfig(
+        max_open_positions=10,
+        max_total_exposure_usdc=500.0,
+        fee_rate=0.02,
+    ))
+
+
+def _new_cb():
+    from core.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+
+    breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=3))
+    breaker.register("Scanner")
+    return breaker
+
+
+def _new_engine(risk):
+    from core.engine import SniperEngine
+
+    return SniperEngine(asyncio.Queue(), risk=risk)
+
+
+@pytest.fixture(scope="module")
+def risk():
+    return _new_risk()
+
+
+@pytest.fixture(scope="module")
+def cb():
+    return _new_cb()
+
+
+@pytest.fixture(scope="module")
+def engine(risk):
+    return _new_engine(risk)
+
+
+@pytest.fixture
+def reset_shared_state(risk, cb, engine):
+    """Restore the shared objects to a fresh instance's state, keeping identity."""
+    yield
+    vars(risk).update(vars(_new_risk()))
+    vars(cb).update(vars(_new_cb()))
+    vars(engine).update(vars(_new_engine(risk)))
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 
 class TestSendAlert:
@@ -17,53 +17,36 @@ class TestSendAlert:
             await send_alert("Test message")
 
     @pytest.mark.asyncio
-    async def test_sends_when_configured(self):
+    async def test_sends_when_configured(self, fake_http):
         with patch("utils.alerts.settings") as mock_settings:
             mock_settings.telegram.enabled = True
             mock_settings.telegram.bot_token = "tok123"
             mock_settings.telegram.chat_id = "chat456"
 
-            mock_resp = AsyncMock()
-            mock_resp.status = 200
-            mock_resp.__aenter__ = AsyncMock(return_value=mock_resp)
-            mock_resp.__aexit__ = AsyncMock(return_value=False)
+            session = fake_http(200)
 
-            mock_session = MagicMock()
-            mock_session.post = MagicMock(return_value=mock_resp)
-            mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_session.__aexit__ = AsyncMock(return_value=False)
-
-            with patch("utils.alerts.aiohttp.ClientSession", return_value=mock_session):
+            with patch("utils.alerts.aiohttp.ClientSession", return_value=session):
                 from utils.alerts import send_alert
 
                 await send_alert("Trade executed!")
 
-                mock_session.post.assert_called_once()
-                call_args = mock_session.post.call_args
-                assert "tok123" in call_args[0][0]
-                payload = call_args[1]["json"]
+                assert len(session.posts) == 1
+                url, kwargs = session.posts[0]
+                assert "tok123" in url
+                payload = kwargs["json"]
                 assert payload["chat_id"] == "chat456"
                 assert "Trade executed!" in payload["text"]
 
     @pytest.mark.asyncio
-    async def test_handles_http_error_gracefully(self):
+    async def test_handles_http_error_gracefully(self, fake_http):
         with patch("utils.alerts.settings") as mock_settings:
             mock_settings.telegram.enabled = True
             mock_settings.telegram.bot_token = "tok"
             mock_settings.telegram.chat_id = "123"
 
-            mock_resp = AsyncMock()
-            mock_resp.status = 403
-            mock_resp.text = AsyncMock(return_value="Forbidden")
-            mock_resp.__aenter__ = AsyncMock(return_value=mock_resp)
-            mock_resp.__aexit__ = AsyncMock(return_value=False)
-
-            mock_session = MagicMock()
-            mock_session.post = MagicMock(return_value=mock_resp)
-            mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_session.__aexit__ = AsyncMock(return_value=False)
+            session = fake_http(403, "Forbidden")
 
-            with patch("utils.alerts.aiohttp.ClientSession", return_value=mock_session):
+            with patch("utils.alerts.aiohttp.ClientSession", return_value=session):
                 from utils.alerts import send_alert
 
                 await send_alert("Test")  # should not raise
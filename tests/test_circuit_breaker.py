@@ -110,6 +110,25 @@ class TestRecordReconnect:
         assert cb.adapter_states["CS2"] == "CLOSED"
 
 
+class TestForceOpen:
+    def test_force_open_skips_failure_counting(self):
+        cb = CircuitBreaker(_cfg())
+        cb.register("CS2")
+        cb.force_open("CS2")
+        assert cb.adapter_states["CS2"] == "OPEN"
+        assert cb.get_health("CS2").consecutive_failures == 0
+
+    def test_force_open_triggers_halt(self):
+        cb = CircuitBreaker(_cfg(min_healthy_adapters=1))
+        cb.register("CS2")
+        cb.force_open("CS2")
+        assert cb.is_halted
+
+    def test_force_open_unknown_adapter(self):
+        cb = CircuitBreaker(_cfg())
+        cb.force_open("Unknown")  # should not raise
+
+
 class TestGlobalHalt:
     def test_halt_when_too_few_healthy(self):
         cb = CircuitBreaker(_cfg(failure_threshold=1, min_healthy_adapters=2))
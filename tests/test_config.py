@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import os
+import re
+from dataclasses import replace
 
 import pytest
 
@@ -10,10 +12,17 @@ from core.config import (
     Settings,
     TelegramConfig,
     TradingConfig,
+    _require,
+    settings,
     validate_config,
 )
 
 
+# Built from the conftest environment at import time; tests that only need
+# default trading values read this instead of re-parsing the env.
+_DEFAULT_TRADING = TradingConfig()
+
+
 def _valid_settings(**overrides) -> Settings:
     """Build a Settings object with valid defaults, applying overrides."""
     poly_kw = {
@@ -51,44 +60,65 @@ def _valid_settings(**overrides) -> Settings:
     return Settings(
         poly=PolymarketConfig(**poly_kw),
         telegram=TelegramConfig(),
-        trading=TradingConfig(**trading_kw),
+        trading=replace(_DEFAULT_TRADING, **trading_kw),
+    )
+
+
+_POLY_KEYS = frozenset(PolymarketConfig.__dataclass_fields__)
+_TRADING_KEYS = frozenset(TradingConfig.__dataclass_fields__)
+
+
+def _with(base: Settings, **overrides) -> Settings:
+    """Copy ``base`` with overrides routed to the poly/trading sub-configs."""
+    poly_kw = {k: v for k, v in overrides.items() if k in _POLY_KEYS}
+    trading_kw = {k: v for k, v in overrides.items() if k in _TRADING_KEYS}
+    return Settings(
+        poly=replace(base.poly, **poly_kw) if poly_kw else base.poly,
+        telegram=base.telegram,
+        trading=replace(base.trading, **trading_kw) if trading_kw else base.trading,
     )
 
 
+def _has(errs: list[str], needle: str) -> bool:
+    """True if any error message contains ``needle``."""
+    return any(needle in e for e in errs)
+
+
+# Messages that must mention two things are matched with one precompiled
+# regex search rather than two substring scans.
+_ADDR_HEX = re.compile(r"POLYMARKET_ADDRESS.*hex").search
+_MIN_LT = re.compile(r"MIN_BUY_PRICE.*less than|less than.*MIN_BUY_PRICE").search
+
+
+@pytest.fixture(scope="module")
+def baseline_settings() -> Settings:
+    return _valid_settings()
+
+
 class TestPolymarketConfig:
     def test_loads_from_env(self):
-        from core.config import PolymarketConfig
-
         cfg = PolymarketConfig()
         assert cfg.address == os.environ["POLYMARKET_ADDRESS"]
         assert cfg.private_key == os.environ["POLY_PRIVATE_KEY"]
 
     def test_default_host(self):
-        from core.config import PolymarketConfig
-
         cfg = PolymarketConfig()
         assert "clob.polymarket.com" in cfg.host
 
     def test_missing_address_raises(self, monkeypatch):
         monkeypatch.delenv("POLYMARKET_ADDRESS", raising=False)
-        from core.config import _require
-
         with pytest.raises(EnvironmentError, match="POLYMARKET_ADDRESS"):
             _require("POLYMARKET_ADDRESS")
 
 
 class TestTelegramConfig:
     def test_disabled_when_empty(self):
-        from core.config import TelegramConfig
-
         cfg = TelegramConfig()
         assert not cfg.enabled
 
     def test_enabled_when_set(self, monkeypatch):
         monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "fake_token")
         monkeypatch.setenv("TELEGRAM_CHAT_ID", "12345")
-        from core.config import TelegramConfig
-
         cfg = TelegramConfig()
         assert cfg.enabled
         assert cfg.bot_token == "fake_token"
@@ -97,9 +127,7 @@ class TestTelegramConfig:
 
 class TestTradingConfig:
     def test_defaults(self):
-        from core.config import TradingConfig
-
-        cfg = TradingConfig()
+        cfg = _DEFAULT_TRADING
         assert cfg.min_buy_price == float(os.getenv("MIN_BUY_PRICE", "0.95"))
         assert cfg.max_buy_price == float(os.getenv("MAX_BUY_PRICE", "0.99"))
         assert cfg.order_size_usdc == 50.0
@@ -109,8 +137,6 @@ class TestTradingConfig:
         monkeypatch.setenv("MAX_BUY_PRICE", "0.90")
         monkeypatch.setenv("ORDER_SIZE_USDC", "100.0")
         monkeypatch.setenv("DRY_RUN", "false")
-        from core.config import TradingConfig
-
         cfg = TradingConfig()
         assert cfg.max_buy_price == 0.90
         assert cfg.order_size_usdc == 100.0
@@ -119,148 +145,84 @@ class TestTradingConfig:
 
 class TestSettings:
     def test_settings_singleton(self):
-        from core.config import settings
-
         assert settings.poly.address == os.environ["POLYMARKET_ADDRESS"]
         assert settings.trading.dry_run is True
 
 
 class TestValidateConfigValid:
-    def test_valid_defaults_pass(self):
-        assert validate_config(_valid_settings()) == []
-
-    def test_valid_with_stop_loss(self):
-        assert validate_config(_valid_settings(stop_loss_pct=0.3)) == []
-
-    def test_valid_edge_max_buy_price_1(self):
-        assert validate_config(_valid_settings(max_buy_price=1.0)) == []
-
-    def test_valid_min_buy_price_zero(self):
-        assert validate_config(_valid_settings(min_buy_price=0.0)) == []
-
-    def test_valid_fee_rate_zero(self):
-        assert validate_config(_valid_settings(fee_rate=0.0)) == []
-
-
-class TestValidateConfigAddress:
-    def test_invalid_address_not_hex(self):
-        errs = validate_config(_valid_settings(address="not_an_address"))
-        assert any("POLYMARKET_ADDRESS" in e and "hex" in e for e in errs)
-
-    def test_invalid_address_wrong_length(self):
-        errs = validate_config(_valid_settings(address="0xTooShort"))
-        assert any("42 characters" in e for e in errs)
-
-    def test_invalid_private_key_not_hex(self):
-        errs = validate_config(_valid_settings(private_key="my_secret"))
-        assert any("POLY_PRIVATE_KEY" in e for e in errs)
-
-
-class TestValidateConfigHost:
-    def test_invalid_host_no_http(self):
-        errs = validate_config(_valid_settings(host="ftp://wrong"))
-        assert any("POLYMARKET_HOST" in e for e in errs)
-
-
-class TestValidateConfigTrading:
-    def test_max_buy_price_zero(self):
-        errs = validate_config(_valid_settings(max_buy_price=0.0))
-        assert any("MAX_BUY_PRICE" in e for e in errs)
-
-    def test_max_buy_price_above_one(self):
-        errs = validate_config(_valid_settings(max_buy_price=1.5))
-        assert any("MAX_BUY_PRICE" in e for e in errs)
-
-    def test_min_buy_price_negative(self):
-        errs = validate_config(_valid_settings(min_buy_price=-0.1))
-        assert any("MIN_BUY_PRICE" in e for e in errs)
-
-    def test_min_exceeds_max(self):
-        errs = validate_config(_valid_settings(min_buy_price=0.90, max_buy_price=0.85))
-        assert any("MIN_BUY_PRICE" in e and "less than" in e for e in errs)
-
-    def test_order_size_negative(self):
-        errs = validate_config(_valid_settings(order_size_usdc=-10.0))
-        assert any("ORDER_SIZE_USDC" in e for e in errs)
-
-    def test_order_size_zero(self):
-        errs = validate_config(_valid_settings(order_size_usdc=0.0))
-        assert any("ORDER_SIZE_USDC" in e for e in errs)
-
-    def test_max_open_positions_zero(self):
-        errs = validate_config(_valid_settings(max_open_positions=0))
-        assert any("MAX_OPEN_POSITIONS" in e for e in errs)
-
-    def test_session_loss_zero(self):
-        errs = validate_config(_valid_settings(max_session_loss_usdc=0.0))
-        assert any("MAX_SESSION_LOSS_USDC" in e for e in errs)
-
-    def test_exposure_zero(self):
-        errs = validate_config(_valid_settings(max_total_exposure_usdc=0.0))
-        assert any("MAX_TOTAL_EXPOSURE_USDC" in e for e in errs)
-
-    def test_order_size_exceeds_exposure(self):
-        errs = validate_config(_valid_settings(
-            order_size_usdc=100.0, max_total_exposure_usdc=50.0,
-        ))
-        assert any("cannot exceed" in e for e in errs)
-
-    def test_negative_cooldown(self):
-        errs = validate_config(_valid_settings(match_cooldown_seconds=-1.0))
-        assert any("MATCH_COOLDOWN_SECONDS" in e for e in errs)
-
-
-class TestValidateConfigFees:
-    def test_fee_rate_negative(self):
-        errs = validate_config(_valid_settings(fee_rate=-0.01))
-        assert any("FEE_RATE" in e for e in errs)
-
-    def test_fee_rate_above_one(self):
-        errs = validate_config(_valid_settings(fee_rate=1.0))
-        assert any("FEE_RATE" in e for e in errs)
-
-    def test_stop_loss_negative(self):
-        errs = validate_config(_valid_settings(stop_loss_pct=-0.1))
-        assert any("STOP_LOSS_PCT" in e for e in errs)
-
-    def test_stop_loss_above_one(self):
-        errs = validate_config(_valid_settings(stop_loss_pct=1.0))
-        assert any("STOP_LOSS_PCT" in e for e in errs)
-
-
-class TestValidateConfigCircuitBreaker:
-    def test_failure_threshold_zero(self):
-        errs = validate_config(_valid_settings(cb_failure_threshold=0))
-        assert any("CB_FAILURE_THRESHOLD" in e for e in errs)
-
-    def test_min_healthy_negative(self):
-        errs = validate_config(_valid_settings(cb_min_healthy_adapters=-1))
-        assert any("CB_MIN_HEALTHY_ADAPTERS" in e for e in errs)
-
-    def test_stale_timeout_zero(self):
-        errs = validate_config(_valid_settings(cb_stale_data_timeout=0.0))
-        assert any("CB_STALE_DATA_TIMEOUT" in e for e in errs)
-
-
-class TestValidateConfigDashboard:
-    def test_port_zero(self):
-        errs = validate_config(_valid_settings(dashboard_port=0))
-        assert any("DASHBOARD_PORT" in e for e in errs)
-
-    def test_port_too_high(self):
-        errs = validate_config(_valid_settings(dashboard_port=70000))
-        assert any("DASHBOARD_PORT" in e for e in errs)
-
-    def test_valid_port(self):
-        assert validate_config(_valid_settings(dashboard_port=3000)) == []
+    def test_valid_defaults_pass(self, baseline_settings):
+        assert validate_config(baseline_settings) == []
+
+    @pytest.mark.parametrize("overrides", [
+        pytest.param({"stop_loss_pct": 0.3}, id="stop_loss"),
+        pytest.param({"max_buy_price": 1.0}, id="edge_max_buy_price_1"),
+        pytest.param({"min_buy_price": 0.0}, id="min_buy_price_zero"),
+        pytest.param({"fee_rate": 0.0}, id="fee_rate_zero"),
+        pytest.param({"dashboard_port": 3000}, id="port_3000"),
+    ])
+    def test_valid_overrides_pass(self, baseline_settings, overrides):
+        assert validate_config(_with(baseline_settings, **overrides)) == []
+
+
+class TestValidateConfigErrors:
+    @pytest.mark.parametrize("overrides,needle", [
+        # -- Credentials / host --
+        pytest.param({"address": "0xTooShort"}, "42 characters", id="address_wrong_length"),
+        pytest.param({"private_key": "my_secret"}, "POLY_PRIVATE_KEY", id="private_key_not_hex"),
+        pytest.param({"host": "ftp://wrong"}, "POLYMARKET_HOST", id="host_no_http"),
+        # -- Trading --
+        pytest.param({"max_buy_price": 0.0}, "MAX_BUY_PRICE", id="max_buy_price_zero"),
+        pytest.param({"max_buy_price": 1.5}, "MAX_BUY_PRICE", id="max_buy_price_above_one"),
+        pytest.param({"min_buy_price": -0.1}, "MIN_BUY_PRICE", id="min_buy_price_negative"),
+        pytest.param({"order_size_usdc": -10.0}, "ORDER_SIZE_USDC", id="order_size_negative"),
+        pytest.param({"order_size_usdc": 0.0}, "ORDER_SIZE_USDC", id="order_size_zero"),
+        pytest.param({"max_open_positions": 0}, "MAX_OPEN_POSITIONS", id="max_open_positions_zero"),
+        pytest.param({"max_session_loss_usdc": 0.0}, "MAX_SESSION_LOSS_USDC", id="session_loss_zero"),
+        pytest.param({"max_total_exposure_usdc": 0.0}, "MAX_TOTAL_EXPOSURE_USDC", id="exposure_zero"),
+        pytest.param(
+            {"order_size_usdc": 100.0, "max_total_exposure_usdc": 50.0},
+            "cannot exceed",
+            id="order_size_exceeds_exposure",
+        ),
+        pytest.param({"match_cooldown_seconds": -1.0}, "MATCH_COOLDOWN_SECONDS", id="negative_cooldown"),
+        # -- Fees & stop-loss --
+        pytest.param({"fee_rate": -0.01}, "FEE_RATE", id="fee_rate_negative"),
+        pytest.param({"fee_rate": 1.0}, "FEE_RATE", id="fee_rate_above_one"),
+        pytest.param({"stop_loss_pct": -0.1}, "STOP_LOSS_PCT", id="stop_loss_negative"),
+        pytest.param({"stop_loss_pct": 1.0}, "STOP_LOSS_PCT", id="stop_loss_above_one"),
+        # -- Circuit breaker --
+        pytest.param({"cb_failure_threshold": 0}, "CB_FAILURE_THRESHOLD", id="failure_threshold_zero"),
+        pytest.param({"cb_min_healthy_adapters": -1}, "CB_MIN_HEALTHY_ADAPTERS", id="min_healthy_negative"),
+        pytest.param({"cb_stale_data_timeout": 0.0}, "CB_STALE_DATA_TIMEOUT", id="stale_timeout_zero"),
+        # -- Dashboard --
+        pytest.param({"dashboard_port": 0}, "DASHBOARD_PORT", id="port_zero"),
+        pytest.param({"dashboard_port": 70000}, "DASHBOARD_PORT", id="port_too_high"),
+    ])
+    def test_validation_error(self, baseline_settings, overrides, needle):
+        errs = validate_config(_with(baseline_settings, **overrides))
+        assert _has(errs, needle)
+
+    @pytest.mark.parametrize("overrides,search", [
+        pytest.param({"address": "not_an_address"}, _ADDR_HEX, id="address_not_hex"),
+        pytest.param({"min_buy_price": 0.90, "max_buy_price": 0.85}, _MIN_LT, id="min_exceeds_max"),
+    ])
+    def test_validation_error_message(self, baseline_settings, overrides, search):
+        errs = validate_config(_with(baseline_settings, **overrides))
+        assert any(search(e) for e in errs)
+
+
+@pytest.fixture(scope="class")
+def multi_err_settings(baseline_settings):
+    return _with(
+        baseline_settings,
+        address="bad",
+        order_size_usdc=-1,
+        fee_rate=2.0,
+        dashboard_port=0,
+    )
 
 
 class TestValidateConfigMultipleErrors:
-    def test_accumulates_all_errors(self):
-        errs = validate_config(_valid_settings(
-            address="bad",
-            order_size_usdc=-1,
-            fee_rate=2.0,
-            dashboard_port=0,
-        ))
+    def test_accumulates_all_errors(self, multi_err_settings):
+        errs = validate_config(multi_err_settings)
         assert len(errs) >= 4
@@ -2,46 +2,36 @@
 
 from __future__ import annotations
 
-import asyncio
-
 import pytest
+import pytest_asyncio
 from aiohttp import web
 from aiohttp.test_utils import AioHTTPTestCase, TestClient, TestServer
 
-from core.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
-from core.dashboard import create_dashboard_app, _build_status
-from core.engine import SniperEngine
-from core.risk import RiskConfig, RiskManager
-
-
-@pytest.fixture
-def risk():
-    return RiskManager(RiskConfig(
-        max_open_positions=10,
-        max_total_exposure_usdc=500.0,
-        fee_rate=0.02,
-    ))
+from core.dashboard import create_dashboard_app
 
+# One TestServer is shared by the whole module, so every test must run on
+# the module-scoped event loop the server was started on.
+pytestmark = [
+    pytest.mark.asyncio(loop_scope="module"),
+    pytest.mark.usefixtures("reset_shared_state"),
+]
 
-@pytest.fixture
-def cb():
-    breaker = CircuitBreaker(CircuitBreakerConfig(failure_threshold=3))
-    breaker.register("Scanner")
-    return breaker
+_PREBUILT_TRADES = [
+    {
+        "game": "market", "team": f"Team{i}", "market": "q",
+        "ask_price": 0.5, "amount": 10.0, "latency_ms": 1.0,
+        "dry_run": True, "open_positions": i, "total_exposure": 10.0,
+    }
+    for i in range(10)
+]
 
 
-@pytest.fixture
-def engine(risk):
-    queue = asyncio.Queue()
-    return SniperEngine(queue, risk=risk)
-
-
-@pytest.fixture
+@pytest.fixture(scope="module")
 def dashboard_app(risk, cb, engine):
     return create_dashboard_app(risk, cb, engine)
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
 async def client(dashboard_app):
     server = TestServer(dashboard_app)
     cli = TestClient(server)
@@ -118,8 +108,7 @@ class TestApiStatus:
         assert data["halt_reason"] == "Test halt"
 
     async def test_status_reflects_cb_halt(self, client, cb):
-        for _ in range(3):
-            cb.record_failure("Scanner", "err")
+        cb.force_open("Scanner")
         resp = await client.get("/api/status")
         data = await resp.json()
         assert data["circuit_breaker_halted"] is True
@@ -158,12 +147,7 @@ class TestApiTrades:
         assert data[0]["latency_ms"] == 42.3
 
     async def test_trades_limit_parameter(self, client, engine):
-        for i in range(10):
-            engine._trades.append({
-                "game": "market", "team": f"Team{i}", "market": "q",
-                "ask_price": 0.5, "amount": 10.0, "latency_ms": 1.0,
-                "dry_run": True, "open_positions": i, "total_exposure": 10.0,
-            })
+        engine._trades.extend(_PREBUILT_TRADES)
         resp = await client.get("/api/trades?limit=3")
         data = await resp.json()
         assert len(data) == 3
@@ -201,37 +185,3 @@ class TestHtmlDashboard:
         text = await resp.text()
         assert "/api/status" in text
         assert "/api/trades" in text
-
-
-# ------------------------------------------------------------------
-# _build_status unit test (no HTTP)
-# ------------------------------------------------------------------
-class TestBuildStatus:
-    def test_build_status_no_cb(self, risk, engine):
-        status = _build_status(risk, None, engine)
-        assert status["circuit_breaker_halted"] is False
-        assert status["adapters"] == {}
-
-    def test_build_status_with_positions(self, risk, cb, engine):
-        risk.record_trade(
-            token_id="tok_abc",
-            game="Valorant",
-            team="SEN",
-            match_id="m5",
-            amount_usdc=100.0,
-            buy_price=0.70,
-        )
-        status = _build_status(risk, cb, engine)
-        assert status["open_positions"] == 1
-        assert status["total_exposure"] == 100.0
-        assert len(status["positions"]) == 1
-        pos = status["positions"][0]
-        assert pos["game"] == "Valorant"
-        assert pos["team"] == "SEN"
-        assert pos["amount_usdc"] == 100.0
-        assert pos["buy_price"] == 0.70
-
-    def test_build_status_adapter_info(self, risk, cb, engine):
-        cb.record_success("Scanner")
-        status = _build_status(risk, cb, engine)
-        assert status["adapters"]["Scanner"]["total_events"] == 1
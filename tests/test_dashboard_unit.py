@@ -0,0 +1,40 @@
+"""Unit tests for the dashboard status builder (no HTTP server)."""
+
+from __future__ import annotations
+
+import pytest
+
+from core.dashboard import _build_status
+
+pytestmark = pytest.mark.usefixtures("reset_shared_state")
+
+
+class TestBuildStatus:
+    def test_build_status_no_cb(self, risk, engine):
+        status = _build_status(risk, None, engine)
+        assert status["circuit_breaker_halted"] is False
+        assert status["adapters"] == {}
+
+    def test_build_status_with_positions(self, risk, cb, engine):
+        risk.record_trade(
+            token_id="tok_abc",
+            game="Valorant",
+            team="SEN",
+            match_id="m5",
+            amount_usdc=100.0,
+            buy_price=0.70,
+        )
+        status = _build_status(risk, cb, engine)
+        assert status["open_positions"] == 1
+        assert status["total_exposure"] == 100.0
+        assert len(status["positions"]) == 1
+        pos = status["positions"][0]
+        assert pos["game"] == "Valorant"
+        assert pos["team"] == "SEN"
+        assert pos["amount_usdc"] == 100.0
+        assert pos["buy_price"] == 0.70
+
+    def test_build_status_adapter_info(self, risk, cb, engine):
+        cb.record_success("Scanner")
+        status = _build_status(risk, cb, engine)
+        assert status["adapters"]["Scanner"]["total_events"] == 1
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, AsyncMock, patch
 
 import pytest
 
+from core import engine as engine_mod
+from core.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+from core.engine import SniperEngine
 from core.risk import RiskConfig, RiskManager
 from core.scanner import Opportunity
 
+# Every test here is a coroutine; share one event loop across the module
+# instead of building and closing a loop per test.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 
 def _make_risk(**overrides) -> RiskManager:
     defaults = dict(
@@ -22,6 +30,10 @@ def _make_risk(**overrides) -> RiskManager:
     return RiskManager(RiskConfig(**defaults))
 
 
+def _make_engine(queue, risk=None, cb=None, state_store=None) -> SniperEngine:
+    return SniperEngine(queue, risk=risk, circuit_breaker=cb, state_store=state_store)
+
+
 def _opp(
     token_id: str = "tok_yes",
     condition_id: str = "cond1",
@@ -40,392 +52,468 @@ def _opp(
     )
 
 
+# Opportunity is frozen, so tests share these instead of rebuilding them.
+_OPP = _opp()
+_OPP_NAVI = _opp(token_id="tok_yes_navi")
+_OPP_C1 = _opp(token_id="tok1", condition_id="c1")
+_OPP_C2 = _opp(token_id="tok2", condition_id="c2")
+_OPP_RACE = _opp(token_id="tok1", condition_id="race1")
+
+
+def _const(value):
+    """Plain coroutine stub for CLOB reads a test never asserts on."""
+    async def _stub(*_args, **_kwargs):
+        return value
+    return _stub
+
+
+def _raises(exc_type, message=""):
+    """Plain coroutine stub that raises a fresh ``exc_type(message)`` on every call."""
+    async def _stub(*_args, **_kwargs):
+        raise exc_type(message)
+    return _stub
+
+
+def _tracked(result):
+    """Coroutine stub returning ``result``; the getter reports its peak concurrency."""
+    in_flight = peak = 0
+
+    async def _stub(*_args, **_kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return result
+    return _stub, lambda: peak
+
+
+# Stop-loss exit of a $50 entry at 0.60, sold at 0.20.
+_SL_PNL = 50.0 / 0.60 * 0.20 - 50.0
+
+_MIXED_RESOLUTIONS = {"c1": "Yes", "c2": "No", "c3": None}
+
+
+async def _mixed_resolution(condition_id):
+    return _MIXED_RESOLUTIONS.get(condition_id)
+
+
+class _SpyStore:
+    """Records every save() call; optionally raises ``error(message)`` after recording."""
+
+    __slots__ = ("calls", "_error", "_message")
+
+    def __init__(self, error: type[Exception] | None = None, message: str = "") -> None:
+        self.calls: list[RiskManager] = []
+        self._error = error
+        self._message = message
+
+    def save(self, risk: RiskManager) -> None:
+        self.calls.append(risk)
+        if self._error is not None:
+            raise self._error(self._message)
+
+
+# Building an AsyncMock is far costlier than resetting one, so every test
+# shares this send_alert stand-in and engine_mocks resets it on entry.
+_ALERT = AsyncMock()
+
+
+@pytest.fixture
+def engine_mocks(monkeypatch):
+    """Patch the engine's polymarket client, settings and alerts together.
+
+    Trading settings default to the values most tests need; individual
+    tests override them on ``engine_mocks.settings.trading``.
+    """
+    settings = SimpleNamespace(trading=SimpleNamespace(
+        min_buy_price=0.0,
+        max_buy_price=0.99,
+        dry_run=True,
+        exit_sell_threshold=0.995,
+    ))
+    monkeypatch.setattr(engine_mod, "settings", settings)
+    _ALERT.reset_mock(return_value=True, side_effect=True)
+    with patch.multiple(engine_mod, polymarket=DEFAULT, send_alert=_ALERT) as patched:
+        pm = patched["polymarket"]
+        pm.get_balance_usdc = _const(100.0)
+        # -1.0 is the client's "balance fetch failed" value: the monitor's
+        # manual-sell check then leaves the position alone.
+        pm.get_token_balance = _const(-1.0)
+        yield SimpleNamespace(pm=pm, settings=settings, alert=_ALERT)
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    """Pin the clock RiskManager reads; tests advance it through ``clock[0]``."""
+    clock = [1_000_000.0]
+    monkeypatch.setattr("core.risk.time", SimpleNamespace(time=lambda: clock[0]))
+    return clock
+
+
 class TestSniperEngineHandleOpportunity:
-    def _make_engine(self, queue, risk=None, cb=None):
-        from core.engine import SniperEngine
-        return SniperEngine(queue, risk=risk, circuit_breaker=cb)
-
-    @pytest.mark.asyncio
-    async def test_empty_order_book_skips(self, event_queue):
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.0, 0.0))
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-
-            engine = self._make_engine(event_queue, risk=_make_risk())
-            await engine._handle_opportunity(_opp())
-            assert len(engine._trades) == 0
-
-    @pytest.mark.asyncio
-    async def test_price_too_high_skips(self, event_queue):
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.995, 1000.0))
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-
-            engine = self._make_engine(event_queue, risk=_make_risk())
-            await engine._handle_opportunity(_opp())
-            assert len(engine._trades) == 0
-
-    @pytest.mark.asyncio
-    async def test_price_too_low_skips(self, event_queue):
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.50, 1000.0))
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.95
-            mock_settings.trading.max_buy_price = 0.99
-
-            engine = self._make_engine(event_queue, risk=_make_risk())
-            await engine._handle_opportunity(_opp())
-            assert len(engine._trades) == 0
-
-    @pytest.mark.asyncio
-    async def test_profitable_trade_executes(self, event_queue):
+    @pytest.mark.parametrize("ask,shares,min_buy,expected", [
+        pytest.param(0.0, 0.0, 0.0, 0, id="empty_order_book"),
+        pytest.param(0.97, 0.0, 0.0, 0, id="no_shares_at_ask"),
+        pytest.param(0.995, 1000.0, 0.0, 0, id="above_max"),
+        pytest.param(0.50, 1000.0, 0.95, 0, id="below_min"),
+        pytest.param(0.99, 1000.0, 0.0, 1, id="exactly_at_max"),
+    ])
+    async def test_price_gate(self, event_queue, engine_mocks, ask, shares, min_buy, expected):
+        engine_mocks.pm.available_liquidity = _const((ask, shares))
+        engine_mocks.pm.market_buy = _const(None)
+        engine_mocks.settings.trading.min_buy_price = min_buy
+
+        engine = _make_engine(event_queue, risk=_make_risk())
+        await engine._handle_opportunity(_OPP)
+        assert len(engine._trades) == expected
+
+    async def test_profitable_trade_executes(self, event_queue, engine_mocks):
         risk = _make_risk()
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.97, 1000.0))
-            mock_pm.market_buy = AsyncMock(return_value={"order_id": "xyz"})
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-            mock_settings.trading.order_size_usdc = 50.0
-            mock_settings.trading.dry_run = False
-
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._handle_opportunity(_opp(token_id="tok_yes_navi"))
-
-            mock_pm.market_buy.assert_called_once_with("tok_yes_navi", pytest.approx(10.0 / 0.97), price=0.97)
-            assert len(engine._trades) == 1
-            assert engine._trades[0]["open_positions"] == 1
-            assert engine._trades[0]["total_exposure"] == 10.0
-            mock_alert.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_dry_run_trade_records(self, event_queue):
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.96, 1000.0))
-            mock_pm.market_buy = AsyncMock(return_value=None)
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-            mock_settings.trading.order_size_usdc = 25.0
-            mock_settings.trading.dry_run = True
-
-            engine = self._make_engine(event_queue, risk=_make_risk())
-            await engine._handle_opportunity(_opp())
-
-            assert len(engine._trades) == 1
-            assert engine._trades[0]["dry_run"] is True
-            assert engine._trades[0]["result"] is None
-
-    @pytest.mark.asyncio
-    async def test_edge_price_exactly_at_max(self, event_queue):
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.99, 1000.0))
-            mock_pm.market_buy = AsyncMock(return_value=None)
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-            mock_settings.trading.order_size_usdc = 50.0
-            mock_settings.trading.dry_run = True
-
-            engine = self._make_engine(event_queue, risk=_make_risk())
-            await engine._handle_opportunity(_opp())
-            assert len(engine._trades) == 1
+        engine_mocks.pm.available_liquidity = _const((0.97, 1000.0))
+        engine_mocks.pm.market_buy = AsyncMock(return_value={"order_id": "xyz"})
+        engine_mocks.settings.trading.dry_run = False
 
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._handle_opportunity(_OPP_NAVI)
 
-class TestEngineRiskIntegration:
-    def _make_engine(self, queue, risk=None, cb=None):
-        from core.engine import SniperEngine
-        return SniperEngine(queue, risk=risk, circuit_breaker=cb)
+        engine_mocks.pm.market_buy.assert_called_once_with("tok_yes_navi", pytest.approx(10.0 / 0.97), price=0.97)
+        assert len(engine._trades) == 1
+        assert engine._trades[0]["open_positions"] == 1
+        assert engine._trades[0]["total_exposure"] == 10.0
+        engine_mocks.alert.assert_called_once()
+
+    async def test_dry_run_trade_records(self, event_queue, engine_mocks):
+        engine_mocks.pm.available_liquidity = _const((0.96, 1000.0))
+        engine_mocks.pm.market_buy = _const(None)
+
+        engine = _make_engine(event_queue, risk=_make_risk())
+        await engine._handle_opportunity(_OPP)
+
+        assert len(engine._trades) == 1
+        assert engine._trades[0]["dry_run"] is True
+        assert engine._trades[0]["result"] is None
 
-    @pytest.mark.asyncio
-    async def test_risk_halt_blocks_trade(self, event_queue):
+
+class TestEngineRiskIntegration:
+    async def test_risk_halt_blocks_trade(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.halt("Test halt")
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.97, 1000.0))
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
+        engine_mocks.pm.available_liquidity = AsyncMock(return_value=(0.97, 1000.0))
+        engine_mocks.pm.get_balance_usdc = AsyncMock(return_value=100.0)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._handle_opportunity(_opp())
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._handle_opportunity(_OPP)
 
-            assert len(engine._trades) == 0
-            mock_pm.available_liquidity.assert_not_called()
+        assert len(engine._trades) == 0
+        # Halt checks run before the first await: no CLOB call of any kind.
+        assert engine_mocks.pm.mock_calls == []
 
-    @pytest.mark.asyncio
-    async def test_risk_dedup_blocks_second_trade(self, event_queue):
+    async def test_risk_dedup_blocks_second_trade(self, event_queue, engine_mocks, frozen_clock):
         risk = _make_risk(dedup_window_seconds=300.0)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.97, 1000.0))
-            mock_pm.market_buy = AsyncMock(return_value=None)
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-            mock_settings.trading.order_size_usdc = 50.0
-            mock_settings.trading.dry_run = True
+        engine_mocks.pm.available_liquidity = _const((0.97, 1000.0))
+        engine_mocks.pm.market_buy = _const(None)
+
+        engine = _make_engine(event_queue, risk=risk)
+
+        opp = _OPP_C1
+        await engine._handle_opportunity(opp)
+        assert len(engine._trades) == 1
 
-            engine = self._make_engine(event_queue, risk=risk)
+        # Close it so only the dedup window, not the open position, can veto.
+        risk.close_position(opp.token_id)
 
-            opp = _opp(token_id="tok1", condition_id="c1")
-            await engine._handle_opportunity(opp)
-            assert len(engine._trades) == 1
+        frozen_clock[0] += 299.0
+        await engine._handle_opportunity(opp)
+        assert len(engine._trades) == 1  # still inside the 300s window
 
-            await engine._handle_opportunity(opp)
-            assert len(engine._trades) == 1  # blocked by dedup
+        frozen_clock[0] += 2.0
+        await engine._handle_opportunity(opp)
+        assert len(engine._trades) == 2
 
-    @pytest.mark.asyncio
-    async def test_risk_exposure_blocks_trade(self, event_queue):
+    async def test_risk_exposure_blocks_trade(self, event_queue, engine_mocks):
         risk = _make_risk(max_total_exposure_usdc=60.0)
         risk.record_trade("tok_prev", "market", "Yes", "c0", 50.0, 0.97)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.97, 1000.0))
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-            mock_settings.trading.order_size_usdc = 50.0
-            mock_settings.trading.dry_run = True
+        engine_mocks.pm.available_liquidity = _const((0.97, 1000.0))
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._handle_opportunity(_opp(token_id="tok2", condition_id="c2"))
-            assert len(engine._trades) == 0
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._handle_opportunity(_OPP_C2)
+        assert len(engine._trades) == 0
 
 
 class TestTradeLock:
-    def _make_engine(self, queue, risk=None, cb=None):
-        from core.engine import SniperEngine
-        return SniperEngine(queue, risk=risk, circuit_breaker=cb)
-
-    @pytest.mark.asyncio
-    async def test_concurrent_same_opp_only_one_passes(self, event_queue):
+    async def test_concurrent_same_opp_only_one_passes(self, event_queue, engine_mocks):
         risk = _make_risk(dedup_window_seconds=300.0)
 
+        entered = asyncio.Event()
+        release = asyncio.Event()
+
         async def slow_buy(token_id, amount, **kwargs):
-            await asyncio.sleep(0.05)
+            entered.set()
+            await release.wait()
             return None
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.97, 1000.0))
-            mock_pm.market_buy = AsyncMock(side_effect=slow_buy)
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-            mock_settings.trading.order_size_usdc = 50.0
-            mock_settings.trading.dry_run = True
-
-            engine = self._make_engine(event_queue, risk=risk)
-            opp = _opp(token_id="tok1", condition_id="race1")
-
-            await asyncio.gather(
-                engine._handle_opportunity(opp),
-                engine._handle_opportunity(opp),
-            )
-
-            assert len(engine._trades) == 1
-            assert risk.open_positions == 1
-
-    @pytest.mark.asyncio
-    async def test_concurrent_different_opps_both_pass(self, event_queue):
+        engine_mocks.pm.available_liquidity = _const((0.97, 1000.0))
+        engine_mocks.pm.market_buy = slow_buy
+
+        engine = _make_engine(event_queue, risk=risk)
+        opp = _OPP_RACE
+
+        # Hold the first buy open until the second caller is queued on the lock.
+        first = asyncio.create_task(engine._handle_opportunity(opp))
+        await entered.wait()
+        second = asyncio.create_task(engine._handle_opportunity(opp))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(first, second)
+
+        assert len(engine._trades) == 1
+        assert risk.open_positions == 1
+
+    async def test_concurrent_different_opps_both_pass(self, event_queue, engine_mocks):
         risk = _make_risk(dedup_window_seconds=300.0)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.97, 1000.0))
-            mock_pm.market_buy = AsyncMock(return_value=None)
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-            mock_settings.trading.order_size_usdc = 50.0
-            mock_settings.trading.dry_run = True
+        engine_mocks.pm.available_liquidity = _const((0.97, 1000.0))
+        engine_mocks.pm.market_buy = _const(None)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            opp1 = _opp(token_id="tok1", condition_id="c1")
-            opp2 = _opp(token_id="tok2", condition_id="c2")
+        engine = _make_engine(event_queue, risk=risk)
+        opp1 = _OPP_C1
+        opp2 = _OPP_C2
 
-            await asyncio.gather(
-                engine._handle_opportunity(opp1),
-                engine._handle_opportunity(opp2),
-            )
+        await asyncio.gather(
+            engine._handle_opportunity(opp1),
+            engine._handle_opportunity(opp2),
+        )
 
-            assert len(engine._trades) == 2
-            assert risk.open_positions == 2
+        assert len(engine._trades) == 2
+        assert risk.open_positions == 2
 
 
 class TestPositionMonitor:
-    def _make_engine(self, queue, risk=None, cb=None):
-        from core.engine import SniperEngine
-        return SniperEngine(queue, risk=risk, circuit_breaker=cb)
-
-    @pytest.mark.asyncio
-    async def test_detects_win_resolution(self, event_queue):
+    async def test_detects_win_resolution(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50, condition_id="c1")
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.get_market_resolution = AsyncMock(return_value="Yes")
-            mock_pm.best_bid = AsyncMock(return_value=0.98)
+        engine_mocks.pm.get_market_resolution = _const("Yes")
+        engine_mocks.pm.best_bid = _const(0.98)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            assert risk.open_positions == 0
-            assert risk.session_pnl == pytest.approx(50.0)
-            mock_alert.assert_called_once()
-            assert "WIN" in mock_alert.call_args[0][0]
+        assert risk.open_positions == 0
+        assert risk.session_pnl == 50.0
+        engine_mocks.alert.assert_called_once()
+        assert "WIN" in engine_mocks.alert.call_args[0][0]
 
-    @pytest.mark.asyncio
-    async def test_detects_loss_resolution(self, event_queue):
+    async def test_detects_loss_resolution(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.60, condition_id="c1")
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.get_market_resolution = AsyncMock(return_value="No")
-            mock_pm.best_bid = AsyncMock(return_value=0.02)
+        engine_mocks.pm.get_market_resolution = _const("No")
+        engine_mocks.pm.best_bid = _const(0.02)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            assert risk.open_positions == 0
-            assert risk.session_pnl == pytest.approx(-50.0)
-            mock_alert.assert_called_once()
-            assert "LOSS" in mock_alert.call_args[0][0]
+        assert risk.open_positions == 0
+        assert risk.session_pnl == -50.0
+        engine_mocks.alert.assert_called_once()
+        assert "LOSS" in engine_mocks.alert.call_args[0][0]
 
-    @pytest.mark.asyncio
-    async def test_no_resolution_keeps_position(self, event_queue):
+    async def test_no_resolution_keeps_position(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.best_bid = AsyncMock(return_value=0.65)
+        engine_mocks.pm.best_bid = _const(0.65)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            assert risk.open_positions == 1
-            assert risk.session_pnl == 0.0
-            mock_alert.assert_not_called()
+        assert risk.open_positions == 1
+        assert risk.session_pnl == 0.0
+        engine_mocks.alert.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_none_price_keeps_position(self, event_queue):
+    async def test_none_price_keeps_position(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.best_bid = AsyncMock(return_value=None)
+        engine_mocks.pm.best_bid = _const(None)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
-            assert risk.open_positions == 1
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
+        assert risk.open_positions == 1
 
-    @pytest.mark.asyncio
-    async def test_api_error_keeps_position(self, event_queue):
+    async def test_api_error_keeps_position(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.best_bid = AsyncMock(side_effect=Exception("API down"))
+        engine_mocks.pm.best_bid = _raises(Exception, "API down")
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
-            assert risk.open_positions == 1
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
+        assert risk.open_positions == 1
 
-    @pytest.mark.asyncio
-    async def test_multiple_positions_mixed(self, event_queue):
+    async def test_multiple_positions_mixed(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50, condition_id="c1")
         risk.record_trade("tok2", "market", "Yes", "c2", 50.0, 0.60, condition_id="c2")
         risk.record_trade("tok3", "market", "No", "c3", 50.0, 0.40, condition_id="c3")
 
-        resolutions = {"c1": "Yes", "c2": "No", "c3": None}
+        engine_mocks.pm.get_market_resolution = _mixed_resolution
+        engine_mocks.pm.best_bid = _const(0.55)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.get_market_resolution = AsyncMock(side_effect=lambda cid: resolutions.get(cid))
-            mock_pm.best_bid = AsyncMock(return_value=0.55)
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
-
-            assert risk.open_positions == 1
-            assert risk._positions[0].token_id == "tok3"
-            assert risk.session_pnl == pytest.approx(0.0)
-            assert mock_alert.call_count == 2
+        assert risk.open_positions == 1
+        assert risk._positions[0].token_id == "tok3"
+        assert risk.session_pnl == 0.0
+        assert engine_mocks.alert.call_count == 2
 
-    @pytest.mark.asyncio
-    async def test_loss_resolution_can_trigger_halt(self, event_queue):
+    async def test_loss_resolution_can_trigger_halt(self, event_queue, engine_mocks):
         risk = _make_risk(max_session_loss_usdc=40.0)
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.60, condition_id="c1")
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.get_market_resolution = AsyncMock(return_value="No")
-            mock_pm.best_bid = AsyncMock(return_value=0.50)
+        engine_mocks.pm.get_market_resolution = _const("No")
+        engine_mocks.pm.best_bid = _const(0.50)
+
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
+
+        assert risk.halted
+        assert risk.session_pnl == -50.0
+
+    async def test_ghost_position_removed_after_repeated_bid_errors(
+        self, event_queue, engine_mocks, monkeypatch,
+    ):
+        monkeypatch.setattr(engine_mod, "STALE_CYCLES_THRESHOLD", 3)
+        risk = _make_risk()
+        risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50)
+
+        engine_mocks.pm.best_bid = _raises(Exception, "API down")
 
-            engine = self._make_engine(event_queue, risk=risk)
+        engine = _make_engine(event_queue, risk=risk)
+        for _ in range(2):
             await engine._check_position_resolutions()
+        assert risk.open_positions == 1
+        engine_mocks.alert.assert_not_called()
+
+        await engine._check_position_resolutions()
+        assert risk.open_positions == 0
+        assert risk._closed_positions[-1].source == "stale-removed"
+        engine_mocks.alert.assert_called_once()
+
+    async def test_manual_sell_cleaned_after_two_zero_balances(
+        self, event_queue, engine_mocks, monkeypatch,
+    ):
+        clock = [1_000_000.0]
+        monkeypatch.setattr(
+            engine_mod, "time", SimpleNamespace(time=lambda: clock[0], perf_counter=lambda: 0.0),
+        )
+        risk = _make_risk()
+        risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50)
+
+        engine_mocks.pm.get_token_balance = AsyncMock(return_value=0.0)
+        engine_mocks.pm.best_bid = AsyncMock(return_value=0.50)
+
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
+        assert risk.open_positions == 1
+        assert engine_mocks.pm.best_bid.await_count == 1
+
+        # Inside the 60s window the balance isn't re-read.
+        clock[0] += 30.0
+        await engine._check_position_resolutions()
+        assert engine_mocks.pm.get_token_balance.await_count == 1
+        assert engine_mocks.pm.best_bid.await_count == 2
+        engine_mocks.alert.assert_not_called()
+
+        # Second zero confirms the manual sell; no quote is fetched for it.
+        clock[0] += 30.0
+        await engine._check_position_resolutions()
+        assert engine_mocks.pm.get_token_balance.await_count == 2
+        assert engine_mocks.pm.best_bid.await_count == 2
+        assert risk.open_positions == 0
+        assert "manual-sell" in engine_mocks.alert.call_args[0][0]
+
+    async def test_no_positions_skips_api(self, event_queue, engine_mocks):
+        store = _SpyStore()
+        engine = _make_engine(event_queue, risk=_make_risk(), state_store=store)
+        await engine._check_position_resolutions()
+
+        assert engine_mocks.pm.mock_calls == []
+        assert store.calls == []
+
+    async def test_positions_checked_concurrently(self, event_queue, engine_mocks):
+        risk = _make_risk()
+        risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50)
+        risk.record_trade("tok2", "market", "Yes", "c2", 50.0, 0.50)
 
-            assert risk.halted
-            assert risk.session_pnl == pytest.approx(-50.0)
+        bid, peak = _tracked(0.65)
+        engine_mocks.pm.best_bid = AsyncMock(side_effect=bid)
 
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-class TestMarketBuyErrorHandling:
-    def _make_engine(self, queue, risk=None, cb=None):
-        from core.engine import SniperEngine
-        return SniperEngine(queue, risk=risk, circuit_breaker=cb)
+        assert engine_mocks.pm.best_bid.await_count == 2
+        assert peak() == 2
+        assert risk.open_positions == 2
+
+    async def test_redeems_never_overlap(self, event_queue, engine_mocks):
+        risk = _make_risk()
+        risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50, condition_id="c1")
+        risk.record_trade("tok2", "market", "Yes", "c2", 50.0, 0.50, condition_id="c2")
+
+        redeem, peak = _tracked({"status": 1})
+        claimer = SimpleNamespace(redeem=AsyncMock(side_effect=redeem))
+
+        engine_mocks.pm.get_market_resolution = _const("Yes")
+        engine_mocks.pm.refresh_balance = _const(None)
+
+        engine = SniperEngine(event_queue, risk=risk, claimer=claimer)
+        await engine._check_position_resolutions()
+
+        assert [c.args[0] for c in claimer.redeem.await_args_list] == ["c1", "c2"]
+        assert peak() == 1
+        assert risk.open_positions == 0
+
+    async def test_position_checks_bounded(self, event_queue, engine_mocks, monkeypatch):
+        monkeypatch.setattr(engine_mod, "POSITION_CHECK_CONCURRENCY", 2)
+        risk = _make_risk(max_open_positions=5, max_positions_per_game=5)
+        for i in range(5):
+            risk.record_trade(f"tok{i}", "market", "Yes", f"c{i}", 10.0, 0.50)
+
+        engine_mocks.pm.best_bid, peak = _tracked(0.65)
+
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
+
+        assert peak() == 2
+        assert risk.open_positions == 5
 
-    @pytest.mark.asyncio
-    async def test_market_buy_exception_no_record(self, event_queue):
+
+class TestMarketBuyErrorHandling:
+    async def test_market_buy_exception_no_record(self, event_queue, engine_mocks):
         risk = _make_risk()
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.97, 1000.0))
-            mock_pm.market_buy = AsyncMock(side_effect=Exception("API timeout"))
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-            mock_settings.trading.order_size_usdc = 50.0
-            mock_settings.trading.dry_run = False
-
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._handle_opportunity(_opp())
-
-            assert len(engine._trades) == 0
-            assert risk.open_positions == 0
-            mock_alert.assert_called_once()
-            assert "Failed" in mock_alert.call_args[0][0]
-
-    @pytest.mark.asyncio
-    async def test_market_buy_failure_allows_retry(self, event_queue):
+        engine_mocks.pm.available_liquidity = _const((0.97, 1000.0))
+        engine_mocks.pm.market_buy = _raises(Exception, "API timeout")
+        engine_mocks.settings.trading.dry_run = False
+
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._handle_opportunity(_OPP)
+
+        assert len(engine._trades) == 0
+        assert risk.open_positions == 0
+        engine_mocks.alert.assert_called_once()
+        assert "Failed" in engine_mocks.alert.call_args[0][0]
+
+    async def test_market_buy_failure_allows_retry(self, event_queue, engine_mocks):
         risk = _make_risk(dedup_window_seconds=300.0)
 
         call_count = 0
@@ -437,429 +525,278 @@ class TestMarketBuyErrorHandling:
                 raise ConnectionError("Network error")
             return {"order_id": "ok"}
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.97, 1000.0))
-            mock_pm.market_buy = AsyncMock(side_effect=fail_then_succeed)
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-            mock_settings.trading.order_size_usdc = 50.0
-            mock_settings.trading.dry_run = False
+        engine_mocks.pm.available_liquidity = _const((0.97, 1000.0))
+        engine_mocks.pm.market_buy = fail_then_succeed
+        engine_mocks.settings.trading.dry_run = False
 
-            engine = self._make_engine(event_queue, risk=risk)
-            opp = _opp(token_id="tok1", condition_id="c1")
+        engine = _make_engine(event_queue, risk=risk)
+        opp = _OPP_C1
 
-            await engine._handle_opportunity(opp)
-            assert len(engine._trades) == 0
+        await engine._handle_opportunity(opp)
+        assert len(engine._trades) == 0
 
-            await engine._handle_opportunity(opp)
-            assert len(engine._trades) == 1
-            assert risk.open_positions == 1
+        await engine._handle_opportunity(opp)
+        assert len(engine._trades) == 1
+        assert risk.open_positions == 1
 
 
 class TestApiResolution:
-    def _make_engine(self, queue, risk=None, cb=None):
-        from core.engine import SniperEngine
-        return SniperEngine(queue, risk=risk, circuit_breaker=cb)
-
-    @pytest.mark.asyncio
-    async def test_api_resolution_win(self, event_queue):
+    async def test_api_resolution_win(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50, condition_id="cond1")
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.get_market_resolution = AsyncMock(return_value="Yes")
+        engine_mocks.pm.get_market_resolution = _const("Yes")
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            assert risk.open_positions == 0
-            assert risk.session_pnl == pytest.approx(50.0)
-            mock_pm.best_bid.assert_not_called()
-            assert "API" in mock_alert.call_args[0][0]
+        assert risk.open_positions == 0
+        assert risk.session_pnl == 50.0
+        engine_mocks.pm.best_bid.assert_not_called()
+        assert "API" in engine_mocks.alert.call_args[0][0]
 
-    @pytest.mark.asyncio
-    async def test_api_resolution_loss(self, event_queue):
+    async def test_api_resolution_loss(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.60, condition_id="cond1")
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.get_market_resolution = AsyncMock(return_value="No")
+        engine_mocks.pm.get_market_resolution = _const("No")
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            assert risk.open_positions == 0
-            assert risk.session_pnl == pytest.approx(-50.0)
+        assert risk.open_positions == 0
+        assert risk.session_pnl == -50.0
 
-    @pytest.mark.asyncio
-    async def test_api_unresolved_keeps_position(self, event_queue):
+    async def test_api_unresolved_keeps_position(self, event_queue, engine_mocks):
         """When API says not resolved, position stays open regardless of price."""
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50, condition_id="cond1")
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.get_market_resolution = AsyncMock(return_value=None)
-            mock_pm.best_bid = AsyncMock(return_value=0.98)
+        engine_mocks.pm.get_market_resolution = _const(None)
+        engine_mocks.pm.best_bid = _const(0.98)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            assert risk.open_positions == 1
-            assert risk.session_pnl == 0.0
-            mock_alert.assert_not_called()
+        assert risk.open_positions == 1
+        assert risk.session_pnl == 0.0
+        engine_mocks.alert.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_no_condition_id_keeps_position(self, event_queue):
+    async def test_no_condition_id_keeps_position(self, event_queue, engine_mocks):
         """Without condition_id, API check is skipped; price alone does not close."""
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.best_bid = AsyncMock(return_value=0.98)
+        engine_mocks.pm.best_bid = _const(0.98)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            assert risk.open_positions == 1
-            mock_pm.get_market_resolution.assert_not_called()
+        assert risk.open_positions == 1
+        engine_mocks.pm.get_market_resolution.assert_not_called()
 
 
 class TestStateSaveOnTrade:
-    def _make_engine(self, queue, risk=None, cb=None, state_store=None):
-        from core.engine import SniperEngine
-        return SniperEngine(queue, risk=risk, circuit_breaker=cb, state_store=state_store)
-
-    @pytest.mark.asyncio
-    async def test_save_called_after_trade(self, event_queue):
-        risk = _make_risk()
-        mock_store = MagicMock()
-
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.97, 1000.0))
-            mock_pm.market_buy = AsyncMock(return_value=None)
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-            mock_settings.trading.order_size_usdc = 50.0
-            mock_settings.trading.dry_run = True
-
-            engine = self._make_engine(event_queue, risk=risk, state_store=mock_store)
-            await engine._handle_opportunity(_opp())
-            mock_store.save.assert_called_once_with(risk)
-
-    @pytest.mark.asyncio
-    async def test_save_called_after_resolution(self, event_queue):
+    async def test_save_called_after_trade(self, event_queue, engine_mocks):
         risk = _make_risk()
-        risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50, condition_id="c1")
-        mock_store = MagicMock()
-
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.get_market_resolution = AsyncMock(return_value="Yes")
-            mock_pm.best_bid = AsyncMock(return_value=0.98)
+        store = _SpyStore()
 
-            engine = self._make_engine(event_queue, risk=risk, state_store=mock_store)
-            await engine._check_position_resolutions()
-            mock_store.save.assert_called_once_with(risk)
+        engine_mocks.pm.available_liquidity = _const((0.97, 1000.0))
+        engine_mocks.pm.market_buy = _const(None)
 
-    @pytest.mark.asyncio
-    async def test_no_save_when_no_store(self, event_queue):
-        risk = _make_risk()
+        engine = _make_engine(event_queue, risk=risk, state_store=store)
+        await engine._handle_opportunity(_OPP)
+        assert store.calls == [risk]
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.97, 1000.0))
-            mock_pm.market_buy = AsyncMock(return_value=None)
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-            mock_settings.trading.order_size_usdc = 50.0
-            mock_settings.trading.dry_run = True
-
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._handle_opportunity(_opp())
-            assert len(engine._trades) == 1
-
-    @pytest.mark.asyncio
-    async def test_save_error_does_not_crash(self, event_queue):
+    async def test_save_called_after_resolution(self, event_queue, engine_mocks):
         risk = _make_risk()
-        mock_store = MagicMock()
-        mock_store.save.side_effect = OSError("disk full")
-
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.available_liquidity = AsyncMock(return_value=(0.97, 1000.0))
-            mock_pm.market_buy = AsyncMock(return_value=None)
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
-            mock_settings.trading.min_buy_price = 0.0
-            mock_settings.trading.max_buy_price = 0.99
-            mock_settings.trading.order_size_usdc = 50.0
-            mock_settings.trading.dry_run = True
-
-            engine = self._make_engine(event_queue, risk=risk, state_store=mock_store)
-            await engine._handle_opportunity(_opp())
-
-            assert len(engine._trades) == 1
-            mock_store.save.assert_called_once()
-
-
-class TestStopLoss:
-    def _make_engine(self, queue, risk=None, cb=None):
-        from core.engine import SniperEngine
-        return SniperEngine(queue, risk=risk, circuit_breaker=cb)
-
-    @pytest.mark.asyncio
-    async def test_stop_loss_triggers_on_price_drop(self, event_queue):
-        risk = _make_risk(stop_loss_pct=0.5)
-        risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.60)
-
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.best_bid = AsyncMock(return_value=0.25)
-            mock_pm.market_sell = AsyncMock(return_value=None)
-            mock_pm.get_token_balance = AsyncMock(return_value=50.0 / 0.60)
-            mock_pm.cancel_orders_for_token = AsyncMock(return_value=0)
+        risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50, condition_id="c1")
+        store = _SpyStore()
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine_mocks.pm.get_market_resolution = _const("Yes")
+        engine_mocks.pm.best_bid = _const(0.98)
 
-            assert risk.open_positions == 0
-            mock_pm.market_sell.assert_called_once()
-            shares_sold = mock_pm.market_sell.call_args[0][1]
-            assert shares_sold == pytest.approx(50.0 / 0.60)
-            mock_alert.assert_called_once()
-            assert "STOP-LOSS" in mock_alert.call_args[0][0]
+        engine = _make_engine(event_queue, risk=risk, state_store=store)
+        await engine._check_position_resolutions()
+        assert store.calls == [risk]
 
-    @pytest.mark.asyncio
-    async def test_stop_loss_pnl_is_negative(self, event_queue):
-        risk = _make_risk(stop_loss_pct=0.5)
-        risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.60)
+    async def test_no_save_when_no_store(self, event_queue, engine_mocks):
+        risk = _make_risk()
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.best_bid = AsyncMock(return_value=0.20)
-            mock_pm.market_sell = AsyncMock(return_value=None)
-            mock_pm.get_token_balance = AsyncMock(return_value=50.0 / 0.60)
-            mock_pm.cancel_orders_for_token = AsyncMock(return_value=0)
+        engine_mocks.pm.available_liquidity = _const((0.97, 1000.0))
+        engine_mocks.pm.market_buy = _const(None)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._handle_opportunity(_OPP)
+        assert len(engine._trades) == 1
 
-            assert risk.session_pnl == pytest.approx(50.0 / 0.60 * 0.20 - 50.0)
+    async def test_save_error_does_not_crash(self, event_queue, engine_mocks):
+        risk = _make_risk()
+        store = _SpyStore(OSError, "disk full")
 
-    @pytest.mark.asyncio
-    async def test_no_stop_loss_when_disabled(self, event_queue):
-        risk = _make_risk(stop_loss_pct=0.0)
-        risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.60)
+        engine_mocks.pm.available_liquidity = _const((0.97, 1000.0))
+        engine_mocks.pm.market_buy = _const(None)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.best_bid = AsyncMock(return_value=0.10)
+        engine = _make_engine(event_queue, risk=risk, state_store=store)
+        await engine._handle_opportunity(_OPP)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        assert len(engine._trades) == 1
+        assert len(store.calls) == 1
 
-            assert risk.open_positions == 1
-            mock_pm.market_sell = AsyncMock()
-            mock_pm.market_sell.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_no_stop_loss_above_threshold(self, event_queue):
-        risk = _make_risk(stop_loss_pct=0.5)
+class TestStopLoss:
+    @pytest.mark.parametrize("stop_pct,bid,sell_error,expected_open,expected_alert", [
+        pytest.param(0.5, 0.25, None, 0, "STOP-LOSS", id="triggers_on_price_drop"),
+        pytest.param(0.0, 0.10, None, 1, None, id="disabled"),
+        pytest.param(0.5, 0.35, None, 1, None, id="above_threshold"),
+        pytest.param(0.5, 0.20, _raises(Exception, "API down"), 1, "Failed", id="sell_failure_keeps_position"),
+    ])
+    async def test_stop_loss(
+        self, event_queue, engine_mocks, stop_pct, bid, sell_error, expected_open, expected_alert,
+    ):
+        risk = _make_risk(stop_loss_pct=stop_pct)
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.60)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.best_bid = AsyncMock(return_value=0.35)
-
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
-            assert risk.open_positions == 1
+        engine_mocks.pm.best_bid = _const(bid)
+        engine_mocks.pm.market_sell = AsyncMock(return_value=None, side_effect=sell_error)
+        engine_mocks.pm.get_token_balance = _const(50.0 / 0.60)
+        engine_mocks.pm.cancel_orders_for_token = _const(0)
+
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
+
+        assert risk.open_positions == expected_open
+        if expected_alert is None:
+            engine_mocks.pm.market_sell.assert_not_called()
+            engine_mocks.alert.assert_not_called()
+        else:
+            engine_mocks.pm.market_sell.assert_called_once()
+            shares_sold = engine_mocks.pm.market_sell.call_args[0][1]
+            assert shares_sold == pytest.approx(50.0 / 0.60)
+            engine_mocks.alert.assert_called_once()
+            assert expected_alert in engine_mocks.alert.call_args[0][0]
 
-    @pytest.mark.asyncio
-    async def test_stop_loss_sell_failure_keeps_position(self, event_queue):
+    async def test_stop_loss_pnl_is_negative(self, event_queue, engine_mocks):
         risk = _make_risk(stop_loss_pct=0.5)
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.60)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.best_bid = AsyncMock(return_value=0.20)
-            mock_pm.market_sell = AsyncMock(side_effect=Exception("API down"))
-            mock_pm.get_token_balance = AsyncMock(return_value=50.0 / 0.60)
-            mock_pm.cancel_orders_for_token = AsyncMock(return_value=0)
+        engine_mocks.pm.best_bid = _const(0.20)
+        engine_mocks.pm.market_sell = _const(None)
+        engine_mocks.pm.get_token_balance = _const(50.0 / 0.60)
+        engine_mocks.pm.cancel_orders_for_token = _const(0)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            assert risk.open_positions == 1
-            mock_alert.assert_called_once()
-            assert "Failed" in mock_alert.call_args[0][0]
+        assert risk.session_pnl == pytest.approx(_SL_PNL)
 
-    @pytest.mark.asyncio
-    async def test_resolution_takes_priority_over_stop_loss(self, event_queue):
+    async def test_resolution_takes_priority_over_stop_loss(self, event_queue, engine_mocks):
         risk = _make_risk(stop_loss_pct=0.5)
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.50, condition_id="c1")
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.get_market_resolution = AsyncMock(return_value="Yes")
-            mock_pm.best_bid = AsyncMock(return_value=0.98)
+        engine_mocks.pm.get_market_resolution = _const("Yes")
+        engine_mocks.pm.best_bid = _const(0.98)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            assert risk.open_positions == 0
-            assert risk.session_pnl == pytest.approx(50.0)
-            assert "STOP-LOSS" not in mock_alert.call_args[0][0]
+        assert risk.open_positions == 0
+        assert risk.session_pnl == 50.0
+        assert "STOP-LOSS" not in engine_mocks.alert.call_args[0][0]
 
-    @pytest.mark.asyncio
-    async def test_stop_loss_can_trigger_session_halt(self, event_queue):
+    async def test_stop_loss_can_trigger_session_halt(self, event_queue, engine_mocks):
         risk = _make_risk(stop_loss_pct=0.5, max_session_loss_usdc=30.0)
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.60)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.best_bid = AsyncMock(return_value=0.10)
-            mock_pm.market_sell = AsyncMock(return_value=None)
-            mock_pm.get_token_balance = AsyncMock(return_value=50.0 / 0.60)
-            mock_pm.cancel_orders_for_token = AsyncMock(return_value=0)
+        engine_mocks.pm.best_bid = _const(0.10)
+        engine_mocks.pm.market_sell = _const(None)
+        engine_mocks.pm.get_token_balance = _const(50.0 / 0.60)
+        engine_mocks.pm.cancel_orders_for_token = _const(0)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
-            assert risk.halted
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
+        assert risk.halted
 
 
 class TestQuickExit:
-    def _make_engine(self, queue, risk=None, cb=None):
-        from core.engine import SniperEngine
-        return SniperEngine(queue, risk=risk, circuit_breaker=cb)
-
-    @pytest.mark.asyncio
-    async def test_quick_exit_sells_at_threshold(self, event_queue):
+    async def test_quick_exit_sells_at_threshold(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.98)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.best_bid = AsyncMock(return_value=0.997)
-            mock_pm.market_sell = AsyncMock(return_value=None)
-            mock_pm.get_token_balance = AsyncMock(return_value=50.0 / 0.98)
-            mock_pm.cancel_orders_for_token = AsyncMock(return_value=0)
-            mock_settings.trading.exit_sell_threshold = 0.995
-            mock_settings.trading.stop_loss_pct = 0.0
-
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine_mocks.pm.best_bid = _const(0.997)
+        engine_mocks.pm.market_sell = AsyncMock(return_value=None)
+        engine_mocks.pm.get_token_balance = _const(50.0 / 0.98)
+        engine_mocks.pm.cancel_orders_for_token = _const(0)
 
-            assert risk.open_positions == 0
-            mock_pm.market_sell.assert_called_once()
-            shares = mock_pm.market_sell.call_args[0][1]
-            assert shares == pytest.approx(50.0 / 0.98)
-            assert "Quick-Exit" in mock_alert.call_args[0][0]
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-    @pytest.mark.asyncio
-    async def test_quick_exit_not_triggered_below_threshold(self, event_queue):
+        assert risk.open_positions == 0
+        engine_mocks.pm.market_sell.assert_called_once()
+        shares = engine_mocks.pm.market_sell.call_args[0][1]
+        assert shares == pytest.approx(50.0 / 0.98)
+        assert "Quick-Exit" in engine_mocks.alert.call_args[0][0]
+
+    async def test_quick_exit_not_triggered_below_threshold(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.98)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.best_bid = AsyncMock(return_value=0.990)
-            mock_settings.trading.exit_sell_threshold = 0.995
-            mock_settings.trading.stop_loss_pct = 0.0
+        engine_mocks.pm.best_bid = _const(0.990)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            assert risk.open_positions == 1
-            mock_alert.assert_not_called()
+        assert risk.open_positions == 1
+        engine_mocks.alert.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_quick_exit_pnl_positive(self, event_queue):
+    async def test_quick_exit_pnl_positive(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "No", "c1", 10.0, 0.98)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.best_bid = AsyncMock(return_value=0.996)
-            mock_pm.market_sell = AsyncMock(return_value=None)
-            mock_pm.get_token_balance = AsyncMock(return_value=10.0 / 0.98)
-            mock_pm.cancel_orders_for_token = AsyncMock(return_value=0)
-            mock_settings.trading.exit_sell_threshold = 0.995
-            mock_settings.trading.stop_loss_pct = 0.0
-
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine_mocks.pm.best_bid = _const(0.996)
+        engine_mocks.pm.market_sell = _const(None)
+        engine_mocks.pm.get_token_balance = _const(10.0 / 0.98)
+        engine_mocks.pm.cancel_orders_for_token = _const(0)
+
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            shares = 10.0 / 0.98
-            expected_pnl = shares * 0.996 - 10.0
-            assert risk.session_pnl == pytest.approx(expected_pnl)
+        shares = 10.0 / 0.98
+        expected_pnl = shares * 0.996 - 10.0
+        assert risk.session_pnl == pytest.approx(expected_pnl)
 
-    @pytest.mark.asyncio
-    async def test_quick_exit_sell_failure_keeps_position(self, event_queue):
+    async def test_quick_exit_sell_failure_keeps_position(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.98)
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.best_bid = AsyncMock(return_value=0.997)
-            mock_pm.market_sell = AsyncMock(side_effect=Exception("API down"))
-            mock_pm.get_token_balance = AsyncMock(return_value=50.0 / 0.98)
-            mock_pm.cancel_orders_for_token = AsyncMock(return_value=0)
-            mock_settings.trading.exit_sell_threshold = 0.995
-            mock_settings.trading.stop_loss_pct = 0.0
-
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine_mocks.pm.best_bid = _const(0.997)
+        engine_mocks.pm.market_sell = _raises(Exception, "API down")
+        engine_mocks.pm.get_token_balance = _const(50.0 / 0.98)
+        engine_mocks.pm.cancel_orders_for_token = _const(0)
+
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            assert risk.open_positions == 1
-            assert "Failed" in mock_alert.call_args[0][0]
+        assert risk.open_positions == 1
+        assert "Failed" in engine_mocks.alert.call_args[0][0]
 
-    @pytest.mark.asyncio
-    async def test_api_resolution_takes_priority_over_quick_exit(self, event_queue):
+    async def test_api_resolution_takes_priority_over_quick_exit(self, event_queue, engine_mocks):
         risk = _make_risk()
         risk.record_trade("tok1", "market", "Yes", "c1", 50.0, 0.98, condition_id="c1")
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.settings") as mock_settings, \
-             patch("core.engine.send_alert", new_callable=AsyncMock) as mock_alert:
-            mock_pm.get_market_resolution = AsyncMock(return_value="Yes")
-            mock_pm.best_bid = AsyncMock(return_value=0.997)
-            mock_settings.trading.exit_sell_threshold = 0.995
-            mock_settings.trading.stop_loss_pct = 0.0
+        engine_mocks.pm.get_market_resolution = _const("Yes")
+        engine_mocks.pm.best_bid = _const(0.997)
 
-            engine = self._make_engine(event_queue, risk=risk)
-            await engine._check_position_resolutions()
+        engine = _make_engine(event_queue, risk=risk)
+        await engine._check_position_resolutions()
 
-            assert risk.open_positions == 0
-            mock_pm.market_sell.assert_not_called()
-            assert "API" in mock_alert.call_args[0][0]
+        assert risk.open_positions == 0
+        engine_mocks.pm.market_sell.assert_not_called()
+        assert "API" in engine_mocks.alert.call_args[0][0]
 
 
 class TestEngineCircuitBreakerIntegration:
-    def _make_engine(self, queue, risk=None, cb=None):
-        from core.engine import SniperEngine
-        return SniperEngine(queue, risk=risk, circuit_breaker=cb)
-
-    @pytest.mark.asyncio
-    async def test_circuit_breaker_halt_blocks_trade(self, event_queue):
-        from core.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
-
+    async def test_circuit_breaker_halt_blocks_trade(self, event_queue, engine_mocks):
         cb = CircuitBreaker(CircuitBreakerConfig(
             failure_threshold=1, min_healthy_adapters=1,
         ))
@@ -867,12 +804,13 @@ class TestEngineCircuitBreakerIntegration:
         cb.record_failure("Scanner", "err")
         assert cb.is_halted
 
-        with patch("core.engine.polymarket") as mock_pm, \
-             patch("core.engine.send_alert", new_callable=AsyncMock):
-            mock_pm.get_balance_usdc = AsyncMock(return_value=100.0)
+        engine_mocks.pm.get_balance_usdc = AsyncMock(return_value=100.0)
 
-            engine = self._make_engine(event_queue, risk=_make_risk(), cb=cb)
-            await engine._handle_opportunity(_opp())
+        risk = _make_risk()
+        engine = _make_engine(event_queue, risk=risk, cb=cb)
+        await engine._handle_opportunity(_OPP)
 
-            assert len(engine._trades) == 0
-            mock_pm.available_liquidity.assert_not_called()
+        assert len(engine._trades) == 0
+        assert risk.open_positions == 0
+        # Halt checks run before the first await: no CLOB call of any kind.
+        assert engine_mocks.pm.mock_calls == []
@@ -93,6 +93,23 @@ class TestRateLimiterConcurrency:
         elapsed = time.monotonic() - start
         assert limiter.stats["total_calls"] == 6
 
+    @pytest.mark.asyncio
+    async def test_concurrent_waiters_are_spaced_at_rate(self):
+        """Waiters beyond the burst must not all wake after the same deficit."""
+        limiter = RateLimiter(rate=20.0, burst=1)
+        start = time.monotonic()
+        done: list[float] = []
+
+        async def caller():
+            await limiter.acquire()
+            done.append(time.monotonic() - start)
+
+        await asyncio.gather(*(caller() for _ in range(5)))
+        done.sort()
+        # 1 from the burst, then 4 more at 20/s -> the last needs ~0.2s.
+        assert done[-1] >= 0.18
+        assert all(b - a >= 0.03 for a, b in zip(done[1:], done[2:]))
+
     @pytest.mark.asyncio
     async def test_avg_wait_ms_in_stats(self):
         limiter = RateLimiter(rate=10.0, burst=1)
@@ -59,6 +59,15 @@ class TestDedup:
         decision = rm.pre_trade_check("tok1", "CS2", "NAVI", "m1", 50.0, 0.60)
         assert decision
 
+    def test_record_trade_prunes_expired_stamps(self):
+        rm = RiskManager(_cfg(dedup_window_seconds=60.0, match_cooldown_seconds=10.0))
+        rm._trade_keys["tok0|m0|g2"] = time.time() - 61.0
+        rm._match_cooldowns["m0"] = time.time() - 11.0
+        rm._match_cooldowns["m9"] = time.time() - 1.0
+        rm.record_trade("tok1", "CS2", "NAVI", "m1", 50.0, 0.60)
+        assert set(rm._trade_keys) == {"tok1|m1|navi"}
+        assert set(rm._match_cooldowns) == {"m1", "m9"}
+
 
 class TestCooldown:
     def test_blocks_same_match_while_position_open(self):